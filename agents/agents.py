@@ -4,11 +4,11 @@ Definitions for the expert agents used in the CO2 storage assessment system.
 
 from praisonaiagents import Agent
 from config.config import LLM_MODEL, KNOWLEDGE_FILES, SYSTEM_CONFIG
-from tools.search_tools import arxiv_search, internet_search
+from tools.search_tools import arxiv_search, arxiv_search_batch, internet_search, parallel_literature_search
 from tools.report_tools import save_co2_report_to_pdf
 
-# All available tools
-TOOLS = [arxiv_search, internet_search, save_co2_report_to_pdf]
+# All available tools; a tuple so no agent can modify the shared set
+TOOLS = (parallel_literature_search, arxiv_search, arxiv_search_batch, internet_search, save_co2_report_to_pdf)
 
 def create_agents():
     """
@@ -33,7 +33,7 @@ def create_agents():
             "that affect reservoir performance. Highlight any reservoir zones where the data supports or undermines CO₂ storage viability."
         ),
         llm=LLM_MODEL,
-        tools=TOOLS,
+        tools=list(TOOLS),
         function_calling_llm=LLM_MODEL,
         knowledge=KNOWLEDGE_FILES,
         knowledge_config=SYSTEM_CONFIG,
@@ -54,7 +54,7 @@ def create_agents():
             "mineral composition, grain distribution, pore network and saturation levels. Provide a detailed assessment of each core's potential impact on CO₂ storage."
         ),
         llm=LLM_MODEL,
-        tools=TOOLS,
+        tools=list(TOOLS),
         function_calling_llm=LLM_MODEL,
         knowledge=KNOWLEDGE_FILES,
         knowledge_config=SYSTEM_CONFIG,
@@ -76,7 +76,7 @@ def create_agents():
             "on reservoir integrity. Consider how these elements influence cap rock continuity and the feasibility of CO₂ storage."
         ),
         llm=LLM_MODEL,
-        tools=TOOLS,
+        tools=list(TOOLS),
         function_calling_llm=LLM_MODEL,
         knowledge=KNOWLEDGE_FILES,
         knowledge_config=SYSTEM_CONFIG,
@@ -99,8 +99,7 @@ def create_agents():
             "Ensure that the report merges internal findings with external insights from targeted web searches."
         ),
         llm=LLM_MODEL,
-        tools=[TOOLS[2]],
-        knowledge_config=SYSTEM_CONFIG,
+        tools=[save_co2_report_to_pdf],
     )
     
     return [
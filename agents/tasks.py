@@ -15,11 +15,14 @@ def create_tasks(agents):
         list: List of Task objects
     """
     # Extract agents by role for clarity
-    petrophysicist = next(a for a in agents if a.role == "Petrophysicist")
-    core_analyst = next(a for a in agents if a.role == "Core Analyst")
-    structural_geologist = next(a for a in agents if a.role == "Structural Geologist")
-    report_writer = next(a for a in agents if a.role == "Technical Report Writer")
+    by_role = {a.role: a for a in agents}
+    petrophysicist = by_role["Petrophysicist"]
+    core_analyst = by_role["Core Analyst"]
+    structural_geologist = by_role["Structural Geologist"]
+    report_writer = by_role["Technical Report Writer"]
     
+    # The three analysis tasks are independent and run concurrently;
+    # the report task waits for all of them through its context.
     petrophysics_analysis_task = Task(
         name="petrophysical_analysis",
         description=(
@@ -27,12 +30,13 @@ def create_tasks(agents):
             "Examine the petrophysical logs and measurements of each reservoir. Analyze parameters such as: "
             "porosity, permeability, and fluid saturation to assess the quality of the identified reservoirs. \n"
             "Also perform an indepth analysis on the pressure and temperature condition in the reservoirs. Also give insight into the reservoirs' chemical reactivity.\n"
-            "Supplement your evaluation by using the arxiv_search and internet_search tool to gather case studies and recent research on petrophysical assessments. "
+            "Supplement your evaluation by using the parallel_literature_search tool (which queries arxiv and the internet at once) to gather case studies and recent research on petrophysical assessments. "
             "Craft your search queries to target research papers that discusses the petrophysics of the well, formation, area, or field described in the report. "
-            "Integrate insights from the well report with findings from arxiv_search and internet_search to generate your final response."
+            "Integrate insights from the well report with the literature findings from parallel_literature_search to generate your final response."
         ),
         agent=petrophysicist,
-        expected_output="A detailed report of the analysis of the petrophysical evaluation of the reservoirs, highlighting their CO₂ storage potential."
+        expected_output="A detailed report of the analysis of the petrophysical evaluation of the reservoirs, highlighting their CO₂ storage potential.",
+        async_execution=True
     )
 
     core_analysis_task = Task(
@@ -40,12 +44,13 @@ def create_tasks(agents):
         description=(
             "If any, first analyze the core sample information provided in the well completion report. Focus on evaluating: "
             "Porosity distribution, Permeability trends, Grain size and sorting, and Mineralogy to determine the suitability of each reservoir for CO₂ storage. \n"
-            "Enhance your analysis by leveraging the arxiv_search and internet_search tools to find recent advancements or case studies in core analysis of these reservoirs. "
+            "Enhance your analysis by leveraging the parallel_literature_search tool (which queries arxiv and the internet at once) to find recent advancements or case studies in core analysis of these reservoirs. "
             "Ensure your search queries are tailored to the retrieve core information specific to the well, formation, area, or field in the well report. "
-            "Combine the internal core analysis with external research results from arxiv_search and internet_search to generate a comprehensive response."
+            "Combine the internal core analysis with the external research results from parallel_literature_search to generate a comprehensive response."
         ),
         agent=core_analyst,
-        expected_output="A detailed assessment of the core samples and their implications for CO₂ storage potential in the reservoirs."
+        expected_output="A detailed assessment of the core samples and their implications for CO₂ storage potential in the reservoirs.",
+        async_execution=True
     )
 
     structural_analysis_task = Task(
@@ -53,12 +58,13 @@ def create_tasks(agents):
         description=(
             "Examine the structural geological information in the well completion report. Identify and assess fault networks, fractures, "
             "and sealing systems that could impact each reservoir's integrity and CO₂ storage potential. \n"
-            "For additional context, invoke the arxiv_search and internet_search tool to retrieve the latest literature on structural controls. "
+            "For additional context, invoke the parallel_literature_search tool (which queries arxiv and the internet at once) to retrieve the latest literature on structural controls. "
             "Ensure your search queries are specifically tailored retrieve fault or seal system information related to the well, formation, area, or field described in the report. "
-            "Integrate the internal structural data with findings from arxiv_search and internet_search to generate a thorough and cohesive response."
+            "Integrate the internal structural data with the literature findings from parallel_literature_search to generate a thorough and cohesive response."
         ),
         agent=structural_geologist,
-        expected_output="An report detailing the structures that overlies each reservoir for CO₂ storage potential."
+        expected_output="An report detailing the structures that overlies each reservoir for CO₂ storage potential.",
+        async_execution=True
     )
 
     generate_report_task = Task(
@@ -78,7 +84,8 @@ def create_tasks(agents):
             "Using the save_co2_report_to_pdf tool, save the report into a pdf file on the system"
         ),
         agent=report_writer,
-        expected_output="A comprehensive technical report detailing the CO₂ storage potential of the reservoirs and associated risks and recommendations."
+        expected_output="A comprehensive technical report detailing the CO₂ storage potential of the reservoirs and associated risks and recommendations.",
+        context=[petrophysics_analysis_task, core_analysis_task, structural_analysis_task]
     )
     
     return [
@@ -2,6 +2,8 @@
 Main entry point for the CO2 Storage Assessment system.
 """
 
+import asyncio
+
 from praisonaiagents import PraisonAIAgents
 from config.config import LLM_MODEL
 from agents import create_agents, create_tasks
@@ -32,8 +34,9 @@ def main():
     
     logger.info("Starting analysis process")
     
-    # Run the system and get the result
-    result = agents_system.start()
+    # Run the system and get the result; astart runs the async analysis
+    # tasks concurrently before the report task
+    result = asyncio.run(agents_system.astart())
     
     logger.info("Analysis complete")
     return result
@@ -2,7 +2,7 @@
 Initialization file for the tools package.
 """
 
-from .search_tools import arxiv_search, internet_search
+from .search_tools import arxiv_search, arxiv_search_batch, internet_search, parallel_literature_search
 from .report_tools import save_co2_report_to_pdf
 
-__all__ = ['arxiv_search', 'internet_search', 'save_co2_report_to_pdf']
+__all__ = ['arxiv_search', 'arxiv_search_batch', 'internet_search', 'parallel_literature_search', 'save_co2_report_to_pdf']
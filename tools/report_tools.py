@@ -3,31 +3,53 @@ Tools for generating and saving reports in PDF format using ReportLab with prope
 and two-column layout.
 """
 
+import functools
 import os
 import re
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Any
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import landscape, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
-    ListFlowable, ListItem, PageBreak, Frame, PageTemplate, NextPageTemplate,
-    FrameBreak, KeepTogether
-)
-from reportlab.platypus.flowables import HRFlowable
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
+# ReportLab is imported inside the functions that use it: the PDF is only built once,
+# at the end of a run, so importing the agents should not pay for loading it.
+if TYPE_CHECKING:
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import ListFlowable, Table
 
+# ReportLab names used on the per-line parsing path. They are bound once by
+# _load_reportlab() rather than imported inside each call, which would cost an
+# import lookup for every markdown line.
+Paragraph = Spacer = inch = None
+
+def _load_reportlab() -> None:
+    """Bind the module-level ReportLab names on first use."""
+    global Paragraph, Spacer, inch
+    if Paragraph is None:
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Paragraph, Spacer
+
+# Precompiled markdown patterns
+_RE_BOLD = re.compile(r'\*\*(.*?)\*\*')
+_RE_ITALIC = re.compile(r'\*(.*?)\*')
+_RE_INLINE = re.compile(r'\*(?P<i>.*?)\*|`(?P<c>.*?)`')
+_RE_HEADER = re.compile(r'^(#{1,4})\s+(.+)$')
+_RE_LIST = re.compile(r'^([-*]|\d+\.)\s+(.+)$')
+_RE_H1_LINE = re.compile(r'^(# .+)$', re.MULTILINE)
+_RE_SANITIZE = re.compile(r'[^\w]')
+
+@functools.lru_cache(maxsize=1)
 def get_styles():
     """
-    Create a fresh document styles for each call.
+    Create the document styles once and reuse them for every report.
+    
+    The returned styles are read-only templates; callers must not mutate them.
     
     Returns:
         Dict: Dictionary of styled objects
     """
-    # Create a fresh copy of the sample stylesheet
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    
+    # Create a copy of the sample stylesheet
     styles = getSampleStyleSheet()
     
     # Create all custom styles without reusing names
@@ -71,12 +93,20 @@ def get_styles():
         leading=14
     )
     
+    # Table header cells that need Paragraph layout, matching the header row's font
+    table_header = ParagraphStyle(
+        name='CustomTableHeader',
+        parent=styles['Normal'],
+        fontName='Helvetica-Bold'
+    )
+    
     # Add the styles to the stylesheet
     styles.add(custom_title)
     styles.add(custom_subtitle)
     styles.add(section_title)
     styles.add(subsection_title)
     styles.add(body_text)
+    styles.add(table_header)
     
     # Create a style mapping for easier reference
     style_map = {
@@ -85,8 +115,10 @@ def get_styles():
         'SectionTitle': section_title,
         'SubsectionTitle': subsection_title,
         'BodyText': body_text,
+        'TableHeader': table_header,
         'Heading3': styles['Heading3'],
-        'Heading4': styles['Heading4']
+        'Heading4': styles['Heading4'],
+        'Normal': styles['Normal']
     }
     
     return style_map
@@ -103,11 +135,18 @@ def save_co2_report_to_pdf(report_content: str, well_name: str = "Well") -> str:
     Returns:
         str: Path to the saved PDF file
     """
+    from reportlab.lib.pagesizes import landscape, A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import (
+        BaseDocTemplate, PageBreak, Frame, PageTemplate, NextPageTemplate, FrameBreak
+    )
+    _load_reportlab()
+    
     reports_dir = "co2_assessment_reports"
     os.makedirs(reports_dir, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    sanitized_well_name = re.sub(r'[^\w]', '_', well_name)
+    sanitized_well_name = _RE_SANITIZE.sub('_', well_name)
     filename = f"{reports_dir}/CO2_Storage_Assessment_{sanitized_well_name}_{timestamp}.pdf"
 
     # Get page dimensions
@@ -148,45 +187,49 @@ def save_co2_report_to_pdf(report_content: str, well_name: str = "Well") -> str:
     title_template = PageTemplate(id='title', frames=[title_frame])
     two_column_template = PageTemplate(id='two_column', frames=[frame1, frame2])
     
-    # Setup document
-    doc = SimpleDocTemplate(
+    # Setup document; the first template drives the first page, so no default
+    # SimpleDocTemplate frames or leading NextPageTemplate('title') are needed
+    doc = BaseDocTemplate(
         filename,
         pagesize=landscape(A4),
+        pageTemplates=[title_template, two_column_template],
         leftMargin=2*cm,
         rightMargin=2*cm,
         topMargin=2*cm,
         bottomMargin=2*cm
     )
     
-    # Replace all instances of CO2 with proper CO₂ subscript
-    report_content = re.sub(r'CO2', 'CO₂', report_content)
+    # Normalise CO2 to CO₂ and apply the remaining styling enhancements
     report_content = apply_styling_enhancements(report_content)
     
     # Process content and build the PDF
     elements = _process_markdown_content(report_content, well_name)
     
-    # Add page template instructions
-    elements.insert(0, NextPageTemplate('title'))
-    
     # Add a page break and switch to two-column layout after the title page
     title_page_end_index = _find_title_page_end(elements)
     if title_page_end_index > 0:
-        elements.insert(title_page_end_index, PageBreak())
-        elements.insert(title_page_end_index + 1, NextPageTemplate('two_column'))
-        
         # Make sure FrameBreak is added between sections to flow to next column
-        for i in range(title_page_end_index + 2, len(elements)):
-            if isinstance(elements[i], Paragraph) and hasattr(elements[i], 'style') and elements[i].style.name == 'CustomSectionTitle':
-                # Add FrameBreak before major sections to ensure they start in a new column if needed
-                elements.insert(i, FrameBreak())
+        body_elements = []
+        for element in elements[title_page_end_index:]:
+            # Add FrameBreak before major sections to ensure they start in a new column if needed;
+            # the first one already starts the body page, where a FrameBreak would leave it blank
+            if _is_section_title(element) and body_elements:
+                body_elements.append(FrameBreak())
+            body_elements.append(element)
+        
+        # NextPageTemplate has to come before the PageBreak so the new page is already two-column
+        elements = elements[:title_page_end_index] + [NextPageTemplate('two_column'), PageBreak()] + body_elements
     
     # Build the document with the templates
-    doc.addPageTemplates([title_template, two_column_template])
     doc.build(elements)
     
     print(f"Report saved to {filename}")
     return filename
 
+def _is_section_title(element: Any) -> bool:
+    """Check whether an element is a top-level section heading."""
+    return isinstance(element, Paragraph) and hasattr(element, 'style') and element.style.name == 'CustomSectionTitle'
+
 def _find_title_page_end(elements: List[Any]) -> int:
     """Find where to end the title page, usually after executive summary."""
     for i, element in enumerate(elements):
@@ -206,7 +249,9 @@ def _process_markdown_content(report_content: str, well_name: str) -> List[Any]:
     Returns:
         list: List of ReportLab flowable elements
     """
-    # Get fresh styles
+    _load_reportlab()
+    
+    # Get the shared styles
     styles = get_styles()
     
     # Create the elements list
@@ -218,50 +263,44 @@ def _process_markdown_content(report_content: str, well_name: str) -> List[Any]:
     elements.append(Spacer(1, 0.3*inch))
     
     # Process the markdown content
-    lines = report_content.strip().split('\n')
-    
     state = {
         'in_table': False,
         'table_data': [],
         'in_list': False,
         'list_items': [],
-        'list_type': None
+        'list_type': None,
+        'paragraph_lines': []
     }
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    for raw_line in report_content.splitlines():
+        line = raw_line.strip()
         
         # Skip empty lines
         if not line:
+            _flush_paragraph(state, styles, elements)
             if state['in_list']:
                 # End of list
                 elements.append(_create_list(state['list_items'], state['list_type'], styles))
                 state['list_items'] = []
                 state['in_list'] = False
                 state['list_type'] = None
-            i += 1
             continue
         
         # Process the line based on its type
-        processed = _process_line(line, state, styles)
-        if processed:
-            if isinstance(processed, list):
-                elements.extend(processed)
-            else:
-                elements.append(processed)
-        i += 1
+        _process_line(line, state, styles, elements)
     
     # Handle any remaining elements
+    _flush_paragraph(state, styles, elements)
+    
     if state['in_table'] and state['table_data']:
-        elements.append(_create_table(state['table_data']))
+        elements.append(_create_table(state['table_data'], styles))
     
     if state['in_list'] and state['list_items']:
         elements.append(_create_list(state['list_items'], state['list_type'], styles))
     
     return elements
 
-def _process_line(line: str, state: Dict[str, Any], styles: Dict[str, ParagraphStyle]) -> Optional[Any]:
+def _process_line(line: str, state: Dict[str, Any], styles: Dict[str, 'ParagraphStyle'], elements: List[Any]) -> None:
     """
     Process a single line of markdown.
     
@@ -269,24 +308,29 @@ def _process_line(line: str, state: Dict[str, Any], styles: Dict[str, ParagraphS
         line: The line to process
         state: Current parsing state
         styles: Document styles
-        
-    Returns:
-        Optional[Any]: ReportLab element(s) or None if integrated into state
+        elements: Flowable list that finished elements are appended to
     """
-    result = []
+    # Only run a pattern when the first character allows it to match
+    first_char = line[0]
+    header_match = _RE_HEADER.match(line) if first_char == '#' else None
+    list_match = None
+    if header_match is None and (first_char in '-*' or first_char.isdigit()):
+        list_match = _RE_LIST.match(line)
     
     # Headers
-    if header_match := re.match(r'^(#{1,4})\s+(.+)$', line):
+    if header_match:
         level = len(header_match.group(1))
         heading_text = header_match.group(2)
         
+        _flush_paragraph(state, styles, elements)
+        
         if state['in_table']:
-            result.append(_create_table(state['table_data']))
+            elements.append(_create_table(state['table_data'], styles))
             state['in_table'] = False
             state['table_data'] = []
         
         if state['in_list']:
-            result.append(_create_list(state['list_items'], state['list_type'], styles))
+            elements.append(_create_list(state['list_items'], state['list_type'], styles))
             state['list_items'] = []
             state['in_list'] = False
             state['list_type'] = None
@@ -301,13 +345,12 @@ def _process_line(line: str, state: Dict[str, Any], styles: Dict[str, ParagraphS
             
         # Add a spacer before section headings for better layout
         if level == 1:
-            result.append(Spacer(1, 0.2*inch))
+            elements.append(Spacer(1, 0.2*inch))
             
-        result.append(Paragraph(heading_text, styles[style_name]))
-        return result
+        elements.append(Paragraph(heading_text, styles[style_name]))
     
     # Lists
-    elif list_match := re.match(r'^([-*]|\d+\.)\s+(.+)$', line):
+    elif list_match:
         prefix = list_match.group(1)
         content = list_match.group(2)
         
@@ -316,9 +359,11 @@ def _process_line(line: str, state: Dict[str, Any], styles: Dict[str, ParagraphS
         else:
             list_type = 'number'
         
+        _flush_paragraph(state, styles, elements)
+        
         if not state['in_list'] or state['list_type'] != list_type:
             if state['in_list']:
-                result.append(_create_list(state['list_items'], state['list_type'], styles))
+                elements.append(_create_list(state['list_items'], state['list_type'], styles))
                 state['list_items'] = []
             state['in_list'] = True
             state['list_type'] = list_type
@@ -326,14 +371,15 @@ def _process_line(line: str, state: Dict[str, Any], styles: Dict[str, ParagraphS
         # Process inline formatting in list items
         formatted_content = _process_inline_formatting(content)
         state['list_items'].append(formatted_content)
-        return None
     
     # Tables
     elif '|' in line:
         # Skip table separator lines
         if '---' in line:
-            return None
-            
+            return
+        
+        _flush_paragraph(state, styles, elements)
+        
         cells = [cell.strip() for cell in line.strip('|').split('|')]
         
         if not state['in_table']:
@@ -344,60 +390,74 @@ def _process_line(line: str, state: Dict[str, Any], styles: Dict[str, ParagraphS
         elif state['in_table']:
             # Extract row
             state['table_data'].append(cells)
-        return None
     
     # Regular paragraph
     else:
-        elements_to_add = []
-        
         if state['in_table']:
-            elements_to_add.append(_create_table(state['table_data']))
-            elements_to_add.append(Spacer(1, 0.2*inch))
+            elements.append(_create_table(state['table_data'], styles))
+            elements.append(Spacer(1, 0.2*inch))
             state['in_table'] = False
             state['table_data'] = []
         
         if state['in_list']:
-            elements_to_add.append(_create_list(state['list_items'], state['list_type'], styles))
+            elements.append(_create_list(state['list_items'], state['list_type'], styles))
             state['list_items'] = []
             state['in_list'] = False
             state['list_type'] = None
         
-        # Process inline formatting
-        processed_line = _process_inline_formatting(line)
-        elements_to_add.append(Paragraph(processed_line, styles['BodyText']))
-        
-        return elements_to_add
+        # Collect the line; consecutive body lines are laid out as one paragraph
+        state['paragraph_lines'].append(_process_inline_formatting(line))
+
+def _flush_paragraph(state: Dict[str, Any], styles: Dict[str, 'ParagraphStyle'], elements: List[Any]) -> None:
+    """Emit the buffered body lines as a single paragraph joined by line breaks."""
+    if state['paragraph_lines']:
+        elements.append(Paragraph('<br/>'.join(state['paragraph_lines']), styles['BodyText']))
+        state['paragraph_lines'] = []
 
 def _process_inline_formatting(text: str) -> str:
     """Process inline markdown formatting properly."""
-    # Process bold first (important for nested formatting)
-    text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-    
-    # Then process italic
-    text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
+    # Process bold first, so a lone '*' earlier in the line cannot claim its asterisks
+    text = _RE_BOLD.sub(r'<strong>\1</strong>', text)
     
-    # Process code blocks
-    text = re.sub(r'`(.*?)`', r'<code>\1</code>', text)
-    
-    # Ensure CO2 is properly formatted with subscript
-    text = re.sub(r'CO2', r'CO<sub>2</sub>', text)
-    
-    return text
+    # Then italic and code in one pass
+    return _RE_INLINE.sub(_format_inline_match, text)
+
+def _format_inline_match(match: re.Match) -> str:
+    """Render one italic or code match, formatting nested spans recursively."""
+    if match['i'] is not None:
+        return f"<i>{_RE_INLINE.sub(_format_inline_match, match['i'])}</i>"
+    return f"<code>{_RE_INLINE.sub(_format_inline_match, match['c'])}</code>"
 
-def _create_table(table_data: List[List[str]]) -> Table:
+def _create_table(table_data: List[List[str]], styles: Dict[str, 'ParagraphStyle']) -> 'Table':
     """Create a ReportLab Table from table data with proper styling."""
+    from reportlab.lib import colors
+    from reportlab.lib.units import cm
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.platypus import Paragraph, Table, TableStyle, KeepTogether
+    
     if not table_data:
         return None
     
-    # Process table data to handle any styling
-    processed_data = []
-    for row in table_data:
-        processed_row = [Paragraph(_process_inline_formatting(cell), getSampleStyleSheet()['Normal']) for cell in row]
-        processed_data.append(processed_row)
-    
     # Calculate appropriate column widths
     col_count = max(len(row) for row in table_data)
     col_width = 7 * cm  # Adjust based on your page width
+    text_width = col_width / col_count - 12  # Minus left and right cell padding
+    
+    # Process table data to handle any styling
+    processed_data = []
+    for row_index, row in enumerate(table_data):
+        font_name = 'Helvetica-Bold' if row_index == 0 else 'Helvetica'
+        cell_style = styles['TableHeader'] if row_index == 0 else styles['Normal']
+        processed_row = []
+        for cell in row:
+            processed = _process_inline_formatting(cell)
+            # Plain text that fits on one line is drawn directly; Paragraph layout is only
+            # needed for markup or text that has to wrap
+            if '<' not in processed and stringWidth(processed, font_name, 10) <= text_width:
+                processed_row.append(processed)
+            else:
+                processed_row.append(Paragraph(processed, cell_style))
+        processed_data.append(processed_row)
     
     # Create Table object with specific column widths
     table = Table(processed_data, colWidths=[col_width/col_count] * col_count)
@@ -422,8 +482,11 @@ def _create_table(table_data: List[List[str]]) -> Table:
     # Wrap in KeepTogether to avoid table breaking across columns
     return KeepTogether(table)
 
-def _create_list(items: List[str], list_type: str, styles: Dict[str, ParagraphStyle]) -> ListFlowable:
+def _create_list(items: List[str], list_type: str, styles: Dict[str, 'ParagraphStyle']) -> 'ListFlowable':
     """Create a ReportLab ListFlowable from list items with proper formatting."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, ListFlowable, ListItem
+    
     if not items:
         return None
     
@@ -450,13 +513,13 @@ def apply_styling_enhancements(report_content: str) -> str:
         str: Enhanced report content
     """
     # Replace CO2 with proper CO₂ format
-    content = re.sub(r'CO2', r'CO₂', report_content)
+    content = report_content.replace('CO2', 'CO₂')
     
     # Enhance headings with additional formatting
-    content = re.sub(r'^(# .+)$', r'\1\n', content, flags=re.MULTILINE)
+    content = _RE_H1_LINE.sub(r'\1\n', content)
     
     # Make sure to handle bold and italic formatting
-    content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-    content = re.sub(r'\*(.*?)\*', r'<i>\1</i>', content)
+    content = _RE_BOLD.sub(r'<strong>\1</strong>', content)
+    content = _RE_ITALIC.sub(r'<i>\1</i>', content)
     
     return content
\ No newline at end of file
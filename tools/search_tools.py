@@ -2,21 +2,244 @@
 Tools for searching external knowledge sources like arXiv and DuckDuckGo.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import os
-import json
+import re
+import time
+import atexit
+import heapq
 import logging
-import arxiv
-from datetime import datetime
+import operator
+import functools
+import threading
+import contextlib
+import httpx
+import hishel
+import numpy as np
+from cachetools import TTLCache
+from cachetools.keys import hashkey
 from duckduckgo_search import DDGS
+from duckduckgo_search.exceptions import RatelimitException, TimeoutException
+from hishel.httpx import SyncCacheTransport
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+try:
+    from lxml import etree as ET
+except ImportError:  # lxml is optional; the standard library parser reads the feed the same way
+    import xml.etree.ElementTree as ET
+
+try:
+    import hyperscan
+except ImportError:  # Hyperscan is optional; CO2 term matching falls back to re
+    hyperscan = None
+
+from config.config import SYSTEM_CONFIG
+from utils.cache_utils import semantic_cache
 
 
 # ------------------------------------------------------------------------------
 # Configure Logging
 # ------------------------------------------------------------------------------
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+HTTP_TIMEOUT = 10.0
+HTTP_HEADERS = {"User-Agent": "co2agent/1.0"}
+# Upper bound on requests in flight at once against each source
+MAX_CONCURRENT_QUERIES = 8
+# Requests per second allowed against each source
+RATE_LIMITS = {"arxiv": 3, "internet": 10}
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+# ------------------------------------------------------------------------------
+# Shared HTTP clients
+# ------------------------------------------------------------------------------
+def _http_cache_path() -> Optional[str]:
+    """Return the path of the on-disk HTTP cache, or None when caching is disabled."""
+    cache_config = SYSTEM_CONFIG["cache"]
+    if not cache_config.get("enabled", False):
+        return None
+    directory = os.path.join(cache_config["directory"], "http")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, "responses.db")
+
+def _http_cache_policy() -> hishel.SpecificationPolicy:
+    """Follow RFC 9111: stored responses are revalidated with their ETag once stale."""
+    return hishel.SpecificationPolicy(cache_options=hishel.CacheOptions(shared=False))
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """Return the shared sync client, created on first use."""
+    transport = httpx.HTTPTransport(http2=True, limits=httpx.Limits(max_keepalive_connections=20))
+    cache_path = _http_cache_path()
+    if cache_path is not None:
+        transport = SyncCacheTransport(
+            next_transport=transport,
+            storage=hishel.SyncSqliteStorage(database_path=cache_path),
+            policy=_http_cache_policy()
+        )
+    # Reusing one client keeps TCP/TLS connections alive between searches
+    client = httpx.Client(transport=transport, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS)
+    atexit.register(client.close)
+    return client
+
+# ------------------------------------------------------------------------------
+# Throttling and retries
+# ------------------------------------------------------------------------------
+class _RateLimiter:
+    """Thread-safe limiter that spaces calls to at most `rate` per second."""
+    
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until the caller may make its request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+# The tools run concurrently from the agents' worker threads, so they share one slot
+# pool and rate limiter per source across threads
+_slots = {name: threading.BoundedSemaphore(MAX_CONCURRENT_QUERIES) for name in RATE_LIMITS}
+_limiters = {name: _RateLimiter(rate) for name, rate in RATE_LIMITS.items()}
+
+@contextlib.contextmanager
+def _throttled(source: str):
+    """Hold a concurrency slot and a rate limit token for one request to source."""
+    with _slots[source]:
+        _limiters[source].acquire()
+        yield
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether a failed request is worth retrying: timeouts, rate limiting and server errors."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, RatelimitException, TimeoutException))
+
+# Retry transient failures with jittered exponential backoff, then re-raise the last error
+_retry_transient = retry(
+    retry=retry_if_exception(_is_transient),
+    wait=wait_exponential_jitter(initial=1, max=10),
+    stop=stop_after_attempt(3),
+    reraise=True
+)
+
+# DDGS keeps its own HTTP session; reuse one per thread since it is not thread-safe
+_ddgs_local = threading.local()
+
+def _get_ddgs() -> DDGS:
+    """Return this thread's DuckDuckGo client."""
+    if not hasattr(_ddgs_local, "ddgs"):
+        _ddgs_local.ddgs = DDGS()
+    return _ddgs_local.ddgs
+
+# ------------------------------------------------------------------------------
+# Result caching
+# ------------------------------------------------------------------------------
+# In-process cache of recent search results, keyed on the normalised query
+_search_cache = TTLCache(maxsize=512, ttl=SYSTEM_CONFIG["cache"]["ttl"])
+_search_cache_lock = threading.Lock()
+
+def _memoize_search(source: str):
+    """
+    Cache a search function's results on (source, normalised query, max_results).
+    
+    Repeated queries within the TTL return without a network round trip. Error results
+    are not cached so a transient failure can be retried.
+    """
+    def decorator(func):
+        if not SYSTEM_CONFIG["cache"].get("enabled", False):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(query: str, max_results: int = 5, *args, **kwargs):
+            key = hashkey(source, query.lower().strip(), max_results)
+            with _search_cache_lock:
+                cached = _search_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            results = func(query, max_results, *args, **kwargs)
+            if not any("error" in result for result in results):
+                with _search_cache_lock:
+                    _search_cache[key] = results
+            return results
+
+        return wrapper
+
+    return decorator
+
+# ------------------------------------------------------------------------------
+# Keyword matching
+# ------------------------------------------------------------------------------
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+def _tokens(text: str) -> frozenset:
+    """Split text into its set of distinct lower-case alphanumeric tokens."""
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+def _token_hits(query_terms: frozenset, texts: List[str]) -> np.ndarray:
+    """Count the query terms occurring as whole words in each of a batch of texts."""
+    return np.fromiter((len(query_terms & _tokens(text)) for text in texts), dtype=np.int32, count=len(texts))
+
+_CO2_STORAGE_TERMS = frozenset({
+    "co2", "carbon", "storage", "sequestration", "reservoir", "porosity",
+    "permeability", "cap rock", "formation", "injection", "geological"
+})
+# Whole-word patterns for the CO2 terms, so that e.g. "storage" does not match "storages"
+_CO2_PATTERNS = [rf"\b{re.escape(term)}\b" for term in sorted(_CO2_STORAGE_TERMS)]
+# One alternation finds every term in a single pass over a text
+_CO2_RE = re.compile("|".join(_CO2_PATTERNS), re.IGNORECASE | re.ASCII)
+
+def _compile_co2_database():
+    """Compile the CO2 storage terms into a Hyperscan database, or None without Hyperscan."""
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database()
+    # SINGLEMATCH reports each term at most once per scan, like the distinct count below
+    database.compile(
+        expressions=[pattern.encode() for pattern in _CO2_PATTERNS],
+        ids=list(range(len(_CO2_PATTERNS))),
+        elements=len(_CO2_PATTERNS),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_CO2_PATTERNS)
+    )
+    return database
+
+_CO2_DATABASE = _compile_co2_database()
+# A database shares one scratch space, so scans must not overlap
+_CO2_DATABASE_LOCK = threading.Lock()
+
+def _co2_term_hits(texts: List[str]) -> np.ndarray:
+    """Count the CO2 storage terms occurring in each of a batch of texts."""
+    if _CO2_DATABASE is None:
+        return np.fromiter(
+            (len({match.lower() for match in _CO2_RE.findall(text)}) for text in texts),
+            dtype=np.int32,
+            count=len(texts)
+        )
+    
+    hits = np.zeros(len(texts), dtype=np.int32)
+    def on_match(term_id, start, end, flags, index):
+        hits[index] += 1
+    
+    with _CO2_DATABASE_LOCK:
+        for index, text in enumerate(texts):
+            _CO2_DATABASE.scan(text.encode(), match_event_handler=on_match, context=index)
+    return hits
+
+# ------------------------------------------------------------------------------
+# arXiv
+# ------------------------------------------------------------------------------
+# The exact-match cache goes outside so repeats skip the query embedding
+@_memoize_search("arxiv")
+@semantic_cache
 def arxiv_search(query: str, max_results: int = 5) -> List[Dict]:
     """
     Search Arxiv for papers and return the results including abstracts.
@@ -32,55 +255,127 @@ def arxiv_search(query: str, max_results: int = 5) -> List[Dict]:
     logger.info(f"Searching Arxiv for: {query}")
     
     try:
-        client = arxiv.Client(num_retries=3, delay_seconds=3)
-        search = arxiv.Search(
-            query=query, 
-            max_results=max_results, 
-            sort_by=arxiv.SortCriterion.Relevance
-        )
-        
-        results = []
-        for paper in client.results(search):
-            try:
-                paper_data = {
-                    "title": paper.title,
-                    "authors": [author.name for author in paper.authors],
-                    "published": paper.published.strftime("%Y-%m-%d"),
-                    "abstract": paper.summary,
-                    "pdf_url": paper.pdf_url,
-                    "categories": paper.categories,
-                    "relevance_score": _calculate_relevance_score(query, paper.title, paper.summary)
-                }
-                results.append(paper_data)
-            except Exception as e:
-                logger.error(f"Error processing paper: {e}")
-                continue
-                
-        # Sort by relevance score
-        results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-        return results
+        response = _get_arxiv_feed(query, max_results)
+        return _parse_arxiv_results(_tokens(query), response.content, max_results)
         
     except Exception as e:
         logger.error(f"Arxiv search failed: {e}")
         return [{"error": f"Search failed: {str(e)}"}]
 
-def _calculate_relevance_score(query: str, title: str, abstract: str) -> float:
-    """Calculate a simple relevance score based on keyword matches"""
-    score = 0
-    query_terms = set(query.lower().split())
+@_retry_transient
+def _get_arxiv_feed(query: str, max_results: int) -> httpx.Response:
+    """Fetch the arXiv Atom feed for a query, within the arXiv rate limit."""
+    with _throttled("arxiv"):
+        response = _get_http_client().get(ARXIV_API_URL, params=_arxiv_params(query, max_results))
+    response.raise_for_status()
+    return response
+
+def _arxiv_params(query: str, max_results: int) -> Dict:
+    """Build the arXiv API query parameters."""
+    return {
+        "search_query": query,
+        "max_results": max_results,
+        "sortBy": "relevance"
+    }
+
+def _parse_arxiv_results(query_terms: frozenset, content: bytes, max_results: int) -> List[Dict]:
+    """Parse an arXiv Atom feed into the top max_results scored papers, best match first."""
+    results = _parse_arxiv_entries(content)
+    if not results:
+        return results
     
-    # Check title (higher weight)
-    for term in query_terms:
-        if term in title.lower():
-            score += 2
-            
-    # Check abstract
-    for term in query_terms:
-        if term in abstract.lower():
-            score += 1
+    # Score the whole feed at once
+    scores = _calculate_relevance_score(query_terms, [r["title"] for r in results], [r["abstract"] for r in results])
+    for result, score in zip(results, scores.tolist()):
+        result["relevance_score"] = score
             
-    return score
+    # Select the top papers; nlargest is stable, so ties keep arXiv's relevance order
+    return heapq.nlargest(max_results, results, key=operator.itemgetter("relevance_score"))
+
+def _parse_arxiv_entries(content: bytes) -> List[Dict]:
+    """Parse an arXiv Atom feed into unscored paper metadata, in feed order."""
+    results = []
+    for entry in ET.fromstring(content).findall(f"{_ATOM}entry"):
+        # Malformed queries come back as a single entry describing the error
+        if "/api/errors" in entry.findtext(f"{_ATOM}id", ""):
+            continue
+        try:
+            results.append(_entry_to_paper(entry))
+        except Exception as e:
+            logger.error(f"Error processing paper: {e}")
+            continue
+    return results
+
+def _entry_to_paper(entry: ET.Element) -> Dict:
+    """Convert an arXiv Atom entry into the paper metadata returned by the search tools."""
+    pdf_links = [link.get("href") for link in entry.findall(f"{_ATOM}link") if link.get("title") == "pdf"]
+    return {
+        "title": re.sub(r"\s+", " ", entry.findtext(f"{_ATOM}title", "")).strip(),
+        "authors": [author.findtext(f"{_ATOM}name") for author in entry.findall(f"{_ATOM}author")],
+        "published": entry.findtext(f"{_ATOM}published", "")[:10],
+        "abstract": entry.findtext(f"{_ATOM}summary", ""),
+        "pdf_url": pdf_links[0] if pdf_links else None,
+        "categories": [category.get("term") for category in entry.findall(f"{_ATOM}category")]
+    }
+
+def _calculate_relevance_score(query_terms: frozenset, titles: List[str], abstracts: List[str]) -> np.ndarray:
+    """Calculate simple relevance scores for a batch of papers based on whole-word keyword matches"""
+    # Title matches carry a higher weight than abstract matches
+    return 2 * _token_hits(query_terms, titles) + _token_hits(query_terms, abstracts)
+
+def arxiv_search_batch(queries: List[str], max_results_per: int = 5) -> Dict[str, List[Dict]]:
+    """
+    Search Arxiv for several queries with a single request.
+    
+    The queries are combined with OR into one arXiv query and the returned papers are
+    then partitioned locally: each query keeps the papers that match at least one of
+    its terms, best match first, or arXiv's top papers when none match. Prefer this over several arxiv_search calls when the
+    queries are known up front, e.g. one per formation.
+    
+    Args:
+        queries (List[str]): Search queries for academic papers. Each should include relevant
+                    geological terms, formation names, or CO2 storage concepts.
+        max_results_per (int): Maximum number of results to return per query.
+        
+    Returns:
+        Dict[str, List[Dict]]: Relevant papers with metadata for each query.
+    """
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return {}
+    logger.info(f"Searching Arxiv for {len(queries)} queries in one request")
+    
+    try:
+        combined_query = " OR ".join(f"({query})" for query in queries)
+        response = _get_arxiv_feed(combined_query, max_results_per * len(queries))
+        return _partition_batch_results(queries, response.content, max_results_per)
+        
+    except Exception as e:
+        logger.error(f"Arxiv batch search failed: {e}")
+        return {query: [{"error": f"Search failed: {str(e)}"}] for query in queries}
 
+def _partition_batch_results(queries: List[str], content: bytes, max_results_per: int) -> Dict[str, List[Dict]]:
+    """Score a combined feed against each query and keep each query's top papers."""
+    papers = _parse_arxiv_entries(content)
+    titles = [paper["title"] for paper in papers]
+    abstracts = [paper["abstract"] for paper in papers]
+    results = {}
+    for query in queries:
+        scores = _calculate_relevance_score(_tokens(query), titles, abstracts)
+        # nlargest is stable, so ties keep arXiv's relevance order
+        ranked = heapq.nlargest(max_results_per, np.flatnonzero(scores).tolist(), key=scores.__getitem__)
+        if not ranked:
+            # arXiv matches stemmed terms ("reservoirs" finds "reservoir"), which whole-word
+            # scoring misses, so fall back to the feed's own order
+            ranked = list(range(min(max_results_per, len(papers))))
+        results[query] = [{**papers[i], "relevance_score": scores[i].item()} for i in ranked]
+    return results
+
+# ------------------------------------------------------------------------------
+# Internet
+# ------------------------------------------------------------------------------
+@_memoize_search("internet")
+@semantic_cache
 def internet_search(query: str, max_results: int = 5) -> List[Dict]:
     """
     Perform an Internet search using DuckDuckGo with improved robustness.
@@ -96,51 +391,77 @@ def internet_search(query: str, max_results: int = 5) -> List[Dict]:
     logger.info(f"Searching internet for: {query}")
     
     try:
-        ddgs = DDGS()
-        results = []
-        
-        # Add specific CO2 storage related terms to improve search relevance
-        enhanced_query = f"{query} CO2 storage reservoir characterization"
-        
-        for result in ddgs.text(keywords=enhanced_query, max_results=max_results):
-            try:
-                results.append({
-                    "title": result.get("title", ""),
-                    "url": result.get("href", ""),
-                    "snippet": result.get("body", ""),
-                    "relevance_score": _calculate_web_relevance(query, result.get("title", ""), result.get("body", ""))
-                })
-            except Exception as e:
-                logger.warning(f"Error processing search result: {e}")
-                continue
-                
-        # Sort results by relevance
-        results.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-        return results
+        return _search_web(query, max_results)
         
     except Exception as e:
         logger.error(f"Internet search failed: {e}")
         return [{"error": f"Search failed: {str(e)}"}]
 
-def _calculate_web_relevance(query: str, title: str, snippet: str) -> float:
-    """Calculate relevance score for web search results"""
-    score = 0
-    co2_storage_terms = ["co2", "carbon", "storage", "sequestration", "reservoir", "porosity", 
-                        "permeability", "cap rock", "formation", "injection", "geological"]
-    
-    # Check for query terms
-    query_terms = query.lower().split()
-    for term in query_terms:
-        if term in title.lower():
-            score += 3
-        if term in snippet.lower():
-            score += 1
-            
-    # Bonus for CO2 storage specific terms
-    for term in co2_storage_terms:
-        if term in title.lower():
-            score += 2
-        if term in snippet.lower():
-            score += 0.5
+def _search_web(query: str, max_results: int) -> List[Dict]:
+    """Fetch and score DuckDuckGo results for a query."""
+    return _process_web_results(_tokens(query), _ddg_text(query, max_results), max_results)
+
+@_retry_transient
+def _ddg_text(query: str, max_results: int) -> List[Dict]:
+    """Run a DuckDuckGo text search within its rate limit and collect the raw results."""
+    # Add specific CO2 storage related terms to improve search relevance
+    enhanced_query = f"{query} CO2 storage reservoir characterization"
+    with _throttled("internet"):
+        return list(_get_ddgs().text(keywords=enhanced_query, max_results=max_results))
+
+def _process_web_results(query_terms: frozenset, raw_results: List[Dict], max_results: int) -> List[Dict]:
+    """Convert raw DuckDuckGo results into the top max_results scored results, best match first."""
+    results = []
+    for result in raw_results:
+        try:
+            results.append({
+                "title": result.get("title", ""),
+                "url": result.get("href", ""),
+                "snippet": result.get("body", "")
+            })
+        except Exception as e:
+            logger.warning(f"Error processing search result: {e}")
+            continue
+    
+    if not results:
+        return results
+    
+    # Score the whole result set at once
+    scores = _calculate_web_relevance(query_terms, [r["title"] for r in results], [r["snippet"] for r in results])
+    for result, score in zip(results, scores.tolist()):
+        result["relevance_score"] = score
             
-    return score
\ No newline at end of file
+    # Select the top results; nlargest is stable, so ties keep search engine order
+    return heapq.nlargest(max_results, results, key=operator.itemgetter("relevance_score"))
+
+def _calculate_web_relevance(query_terms: frozenset, titles: List[str], snippets: List[str]) -> np.ndarray:
+    """Calculate relevance scores for a batch of web search results"""
+    # Whole-word query matches, plus a bonus for CO2 storage specific terms
+    return (3 * _token_hits(query_terms, titles) + _token_hits(query_terms, snippets)
+            + 2 * _co2_term_hits(titles) + 0.5 * _co2_term_hits(snippets))
+
+# Long-lived worker threads, so each keeps reusing its own DDGS session across calls.
+# Sized for the three analysis tasks each running one combined search at a time
+_LITERATURE_EXECUTOR = ThreadPoolExecutor(max_workers=6, thread_name_prefix="literature-search")
+
+def parallel_literature_search(query: str, max_results: int = 5) -> Dict[str, List[Dict]]:
+    """
+    Search Arxiv and the internet for the same query concurrently.
+    
+    Args:
+        query (str): Search query. Should include relevant geological terms,
+                    formation names, or CO2 storage concepts for better results.
+        max_results (int): Maximum number of results to return from each source.
+        
+    Returns:
+        Dict[str, List[Dict]]: Results keyed by source ("arxiv" and "internet").
+    """
+    logger.info(f"Searching Arxiv and internet in parallel for: {query}")
+    
+    # Both searches are network-bound, so threads overlap their round trips
+    arxiv_future = _LITERATURE_EXECUTOR.submit(arxiv_search, query, max_results)
+    internet_future = _LITERATURE_EXECUTOR.submit(internet_search, query, max_results)
+    return {
+        "arxiv": arxiv_future.result(),
+        "internet": internet_future.result()
+    }
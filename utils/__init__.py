@@ -3,5 +3,6 @@ Initialization file for the utils package.
 """
 
 from .logging_utils import setup_logging
+from .cache_utils import semantic_cache
 
-__all__ = ['setup_logging']
+__all__ = ['setup_logging', 'semantic_cache']
@@ -0,0 +1,239 @@
+"""
+Semantic caching for the CO2 Storage Assessment tools.
+
+Responses are stored alongside an embedding of the query that produced them, so a
+repeated or paraphrased query can be answered from disk instead of the network.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from config.config import SYSTEM_CONFIG
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+SIMILARITY_THRESHOLD = 0.92
+# The whole index is rewritten on every store, so keep it bounded
+MAX_ENTRIES = 2000
+
+
+def _best_match_numpy(embeddings: np.ndarray, query: np.ndarray, mask: np.ndarray) -> Tuple[int, float]:
+    """Return the index and similarity of the best unit-vector match among masked rows."""
+    candidates = np.flatnonzero(mask)
+    if candidates.size == 0:
+        return -1, -1.0
+    similarities = embeddings[candidates] @ query
+    best = int(np.argmax(similarities))
+    return int(candidates[best]), float(similarities[best])
+
+def _best_match_loop(embeddings, query, mask):
+    """
+    Loop form of _best_match_numpy, compiled by Numba when it is available.
+
+    Scores the masked rows in a single pass instead of first copying them out of the
+    matrix.
+    """
+    best_index = -1
+    best_similarity = -1.0
+    for i in range(embeddings.shape[0]):
+        if not mask[i]:
+            continue
+        similarity = 0.0
+        for j in range(embeddings.shape[1]):
+            similarity += embeddings[i, j] * query[j]
+        if similarity > best_similarity:
+            best_index = i
+            best_similarity = similarity
+    return best_index, best_similarity
+
+@functools.lru_cache(maxsize=1)
+def _get_best_match() -> Callable:
+    """Return the best-match kernel, compiling it with Numba on first use if installed."""
+    # Imported here rather than at module load, since importing Numba slows down startup
+    try:
+        from numba import njit
+    except ImportError:  # Numba is optional; lookups fall back to NumPy
+        return _best_match_numpy
+    # cache=True keeps the compiled kernel on disk across runs
+    return njit(cache=True, fastmath=True)(_best_match_loop)
+
+
+class SemanticCache:
+    """
+    Embedding-indexed response store persisted under a cache directory.
+
+    Entries are grouped by namespace (the tool name plus its non-query arguments), and a
+    lookup only considers entries of the same namespace that are younger than the TTL.
+    """
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, threshold: float = SIMILARITY_THRESHOLD):
+        self.directory = directory
+        self.ttl = ttl
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._model = None
+        # Separate from _lock so a slow first model load does not block lookups in progress
+        self._model_lock = threading.Lock()
+        self._embeddings_path = os.path.join(directory, "embeddings.npy")
+        self._entries_path = os.path.join(directory, "entries.json")
+        self._embeddings, self._entries = self._load()
+        # Per-entry arrays so the namespace and TTL filters are vectorized
+        self._namespace_ids = {}
+        self._entry_namespaces = np.array(
+            [self._namespace_id(entry["namespace"]) for entry in self._entries], dtype=np.int64
+        )
+        self._entry_created = np.array([entry["created"] for entry in self._entries], dtype=np.float64)
+        self._evict(time.time())
+
+    def _namespace_id(self, namespace: str) -> int:
+        """Map a namespace to a small integer id."""
+        return self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+
+    def _load(self):
+        """Load the persisted index, or start an empty one."""
+        if os.path.exists(self._embeddings_path) and os.path.exists(self._entries_path):
+            try:
+                embeddings = np.load(self._embeddings_path)
+                with open(self._entries_path, "rb") as f:
+                    entries = orjson.loads(f.read())
+                if len(entries) == len(embeddings):
+                    return embeddings.astype(np.float32), entries
+                logger.warning("Semantic cache index is inconsistent, starting a new one")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load semantic cache: {e}")
+        return np.empty((0, 0), dtype=np.float32), []
+
+    def _evict(self, now: float):
+        """Drop entries older than the TTL, then the oldest entries beyond MAX_ENTRIES."""
+        keep = np.ones(len(self._entries), dtype=bool)
+        if self.ttl is not None:
+            keep &= self._entry_created > now - self.ttl
+        # Entries are appended in creation order, so the oldest come first
+        keep[:max(0, len(self._entries) - MAX_ENTRIES)] = False
+        if keep.all():
+            return
+        self._embeddings = self._embeddings[keep]
+        self._entries = [entry for entry, kept in zip(self._entries, keep) if kept]
+        self._entry_namespaces = self._entry_namespaces[keep]
+        self._entry_created = self._entry_created[keep]
+
+    def _save(self):
+        """Persist the index to disk."""
+        os.makedirs(self.directory, exist_ok=True)
+        np.save(self._embeddings_path, self._embeddings)
+        # The whole index is rewritten on every store, so use the faster serializer
+        with open(self._entries_path, "wb") as f:
+            f.write(orjson.dumps(self._entries))
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed text into a unit-length vector so cosine similarity is a dot product."""
+        if self._model is None:
+            with self._model_lock:
+                # Checked again under the lock so concurrent first calls load the model once
+                if self._model is None:
+                    # Imported lazily: loading the model is only worth it once a cached tool runs
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    def lookup(self, namespace: str, query: str) -> Optional[Any]:
+        """Return the cached response for the most similar query, or None on a miss."""
+        query_embedding = self._embed(query)
+        with self._lock:
+            if not self._entries or namespace not in self._namespace_ids:
+                return None
+            mask = self._entry_namespaces == self._namespace_ids[namespace]
+            if self.ttl is not None:
+                mask &= self._entry_created > time.time() - self.ttl
+            best, similarity = _get_best_match()(self._embeddings, query_embedding, mask)
+            if best < 0 or similarity < self.threshold:
+                return None
+            entry = self._entries[best]
+        logger.info(f"Semantic cache hit for '{query}' (matched '{entry['query']}', similarity {similarity:.3f})")
+        return entry["response"]
+
+    def store(self, namespace: str, query: str, response: Any):
+        """Add a response to the cache, evict stale entries and persist the index."""
+        query_embedding = self._embed(query)
+        with self._lock:
+            if self._embeddings.size:
+                self._embeddings = np.vstack([self._embeddings, query_embedding])
+            else:
+                self._embeddings = query_embedding[np.newaxis, :]
+            created = time.time()
+            self._entries.append({
+                "namespace": namespace,
+                "query": query,
+                "created": created,
+                "response": response
+            })
+            self._entry_namespaces = np.append(self._entry_namespaces, self._namespace_id(namespace))
+            self._entry_created = np.append(self._entry_created, created)
+            self._evict(created)
+            self._save()
+
+
+_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+def get_semantic_cache() -> SemanticCache:
+    """Return the process-wide semantic cache configured from SYSTEM_CONFIG."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            cache_config = SYSTEM_CONFIG["cache"]
+            _cache = SemanticCache(
+                directory=os.path.join(cache_config["directory"], "semantic"),
+                ttl=cache_config.get("ttl")
+            )
+        return _cache
+
+def semantic_cache(func: Callable) -> Callable:
+    """
+    Cache a search tool's results by the meaning of its query.
+
+    The wrapped function must take the query as its first argument and return a
+    JSON-serializable result. Results that report an error are not cached.
+    """
+    if not SYSTEM_CONFIG["cache"].get("enabled", False):
+        return func
+
+    signature = inspect.signature(func)
+    query_param = next(iter(signature.parameters))
+
+    @functools.wraps(func)
+    def wrapper(query: str, *args, **kwargs):
+        # Key on the remaining arguments with defaults filled in, so equivalent calls share entries
+        bound = signature.bind(query, *args, **kwargs)
+        bound.apply_defaults()
+        options = dict(bound.arguments)
+        options.pop(query_param)
+        namespace = f"{func.__name__}:{json.dumps(options, sort_keys=True, default=str)}"
+        cache = get_semantic_cache()
+        try:
+            cached = cache.lookup(namespace, query)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            return cached
+
+        result = func(query, *args, **kwargs)
+        if not any(isinstance(item, dict) and "error" in item for item in result):
+            try:
+                cache.store(namespace, query, result)
+            except Exception as e:
+                logger.warning(f"Semantic cache store failed: {e}")
+        return result
+
+    return wrapper
@@ -6,9 +6,12 @@ import logging
 
 def setup_logging():
     """Configure the logging system with appropriate format and level."""
+    logger = logging.getLogger(__name__)
+    # Leave logging alone if the host application has already configured it
+    if logging.getLogger().handlers:
+        return logger
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s'
     )
-    logger = logging.getLogger(__name__)
     return logger